@@ -1,10 +1,13 @@
+from __future__ import annotations
+
+import base64
 import logging
 import time
+from dataclasses import dataclass
 
-import requests
-import urllib3
+import aiohttp
+import orjson
 from aiohttp.client_exceptions import ClientError, ClientResponseError
-from gql.transport.exceptions import TransportQueryError
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ACCESS_TOKEN
 from homeassistant.core import HomeAssistant
@@ -16,11 +19,35 @@ from homeassistant.helpers.config_entry_oauth2_flow import (
 
 from .const import DOMAIN, PLATFORMS
 from .graphql import PostNLGraphql
+from .jouw_api import PostNLJouwAPI
 from .login_api import PostNLLoginAPI
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _decode_jwt_exp(token: str) -> float | None:
+    """Return the exp claim of a JWT access token, or None if unreadable."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = orjson.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError):
+        return None
+
+    return claims.get("exp")
+
+
+@dataclass
+class PostNLRuntimeData:
+    """Runtime objects shared by everything tied to one config entry."""
+
+    auth: AsyncConfigEntryAuth
+    session: aiohttp.ClientSession
+    graphql: PostNLGraphql
+    jouw_api: PostNLJouwAPI
+    userinfo: dict | None = None
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> True:
     """Set up PostNL from config entry."""
     _LOGGER.debug("Setup Entry PostNL")
@@ -33,53 +60,66 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> True:
 
     try:
         await auth.check_and_refresh_token()
-    except requests.exceptions.ConnectionError as exception:
+    except ClientError as exception:
         raise ConfigEntryNotReady("Unable to retrieve oauth data from PostNL") from exception
 
-    hass.data[DOMAIN][entry.entry_id] = {
-        'auth': auth
-    }
+    client_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=20,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+    )
+
+    entry_data = PostNLRuntimeData(
+        auth=auth,
+        session=client_session,
+        graphql=PostNLGraphql(auth.access_token),
+        jouw_api=PostNLJouwAPI(auth.access_token, client_session)
+    )
+    hass.data[DOMAIN][entry.entry_id] = entry_data
 
     _LOGGER.debug('Using access token: %s', auth.access_token)
 
-    postnl_login_api = PostNLLoginAPI(auth.access_token)
+    postnl_login_api = PostNLLoginAPI(auth.access_token, client_session)
 
     try:
-        userinfo = await hass.async_add_executor_job(postnl_login_api.userinfo)
-    except (requests.exceptions.RequestException, urllib3.exceptions.MaxRetryError) as exception:
+        userinfo = await postnl_login_api.userinfo()
+    except ClientError as exception:
+        await client_session.close()
         raise ConfigEntryNotReady("Unable to retrieve user information from PostNL.") from exception
 
     if "error" in userinfo:
+        await client_session.close()
         raise ConfigEntryNotReady("Error in retrieving user information from PostNL.")
 
-    hass.data[DOMAIN][entry.entry_id]['userinfo'] = userinfo
+    entry_data.userinfo = userinfo
 
     device_registry = dr.async_get(hass)
     entity_registry = er.async_get(hass)
 
-    for device_entry in dr.async_entries_for_config_entry(
-            device_registry, entry.entry_id
-    ):
-        if (
-                device_entry.identifiers == {(DOMAIN, userinfo.get('account_id'))}
+    account_id = userinfo.get('account_id')
+    device_entry = device_registry.async_get_device(identifiers={(DOMAIN, account_id)})
+
+    if device_entry:
+        _LOGGER.debug(
+            "Migrating entry %s", device_entry.identifiers
+        )
+        account_prefix = account_id + "_"
+        for entity_entry in er.async_entries_for_device(
+                entity_registry, device_entry.id, True
         ):
-            _LOGGER.debug(
-                "Migrating entry %s", device_entry.identifiers
+            _LOGGER.debug('Migrating entity: %s', entity_entry.unique_id)
+            if entity_entry.unique_id.startswith(account_id):
+                continue
+
+            unique_id_parts = entity_entry.unique_id.split("_", 1)
+            entity_new_unique_id = account_prefix + (
+                unique_id_parts[1] if len(unique_id_parts) > 1 else unique_id_parts[0])
+            _LOGGER.debug('New unique ID for entity: %s', entity_new_unique_id)
+            entity_registry.async_update_entity(
+                entity_id=entity_entry.entity_id, new_unique_id=entity_new_unique_id
             )
-            for entity_entry in er.async_entries_for_device(
-                    entity_registry, device_entry.id, True
-            ):
-                _LOGGER.debug('Migrating entity: %s', entity_entry.unique_id)
-                if entity_entry.unique_id.startswith(userinfo.get('account_id')):
-                    continue
-
-                unique_id_parts = entity_entry.unique_id.split("_")
-                entity_new_unique_id = userinfo.get('account_id') + "_" + (
-                    unique_id_parts[1] if len(unique_id_parts) > 1 else unique_id_parts[0])
-                _LOGGER.debug('New unique ID for entity: %s', entity_new_unique_id)
-                entity_registry.async_update_entity(
-                    entity_id=entity_entry.entity_id, new_unique_id=entity_new_unique_id
-                )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -92,7 +132,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data: PostNLRuntimeData = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data.session.close()
 
     return unload_ok
 
@@ -106,23 +147,41 @@ class AsyncConfigEntryAuth:
     ) -> None:
         """Initialize PostNL Auth."""
         self.oauth_session = oauth2_session
+        self._validated_token: str | None = None
 
     @property
     def access_token(self) -> str:
         """Return the access token."""
         return self.oauth_session.token[CONF_ACCESS_TOKEN]
 
-    async def force_refresh_expire(self):
+    async def force_token_refresh(self) -> None:
+        """Refresh the token now, without rewinding its expiry timestamp."""
         _LOGGER.debug('Force token refresh')
-        self.oauth_session.token["expires_at"] = time.time() - 600
+        self._validated_token = None
+        new_token = await self.oauth_session.implementation.async_refresh_token(
+            self.oauth_session.token
+        )
+        self.oauth_session.hass.config_entries.async_update_entry(
+            self.oauth_session.config_entry,
+            data={**self.oauth_session.config_entry.data, "token": new_token},
+        )
 
     async def check_and_refresh_token(self) -> str:
         """Check the token."""
 
         try:
             await self.oauth_session.async_ensure_token_valid()
-            graphql = PostNLGraphql(self.access_token)
-            await self.oauth_session.hass.async_add_executor_job(graphql.profile)
+
+            if self.access_token == self._validated_token:
+                _LOGGER.debug('Access token unchanged, skipping expiry check')
+                return self.access_token
+
+            expires_at = _decode_jwt_exp(self.access_token)
+            if expires_at is not None and expires_at <= time.time() + 60:
+                _LOGGER.debug('Access token JWT expired despite stored expiry, forcing refresh')
+                await self.force_token_refresh()
+
+            self._validated_token = self.access_token
 
         except (ClientResponseError, ClientError) as exception:
             _LOGGER.debug("API error: %s", exception)
@@ -132,10 +191,5 @@ class AsyncConfigEntryAuth:
                 )
 
             raise HomeAssistantError(exception) from exception
-        except TransportQueryError as exception:
-            _LOGGER.debug("GraphQL error: %s", exception)
-
-            await self.force_refresh_expire()
-            await self.oauth_session.async_ensure_token_valid()
 
         return self.access_token
@@ -1,21 +1,27 @@
 import asyncio
 import logging
+import time
 from datetime import timedelta
 
-import requests
+from aiohttp import ClientError
+from gql.transport.exceptions import TransportQueryError
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import (DataUpdateCoordinator,
                                                       UpdateFailed)
 
-from . import AsyncConfigEntryAuth, PostNLGraphql
+from . import PostNLGraphql, PostNLRuntimeData
 from .const import DOMAIN
 from .jouw_api import PostNLJouwAPI
 from .structs.package import Package
 
 _LOGGER = logging.getLogger(__name__)
 
+TRACK_AND_TRACE_TTL = 300
+UPDATE_TIMEOUT = 75
+
+
 class PostNLCoordinator(DataUpdateCoordinator):
-    data: dict[str, list[Package]]
+    data: dict[str, dict[str, list[Package]]]
     graphq_api: PostNLGraphql
     jouw_api: PostNLJouwAPI
 
@@ -26,100 +32,211 @@ class PostNLCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name="PostNL",
             update_interval=timedelta(seconds=90),
+            always_update=False,
         )
+        self._tnt_cache: dict[str, tuple[float, str | None, dict]] = {}
+        self._tnt_inflight: dict[str, asyncio.Task] = {}
         _LOGGER.debug("PostNLCoordinator initialized with update interval: %s", self.update_interval)
         
-    async def _async_update_data(self) -> dict[str, list[Package]]:
+    async def _async_update_data(self) -> dict[str, dict[str, list[Package]]]:
         _LOGGER.debug("Starting data update for PostNL.")
         try:
-            auth: AsyncConfigEntryAuth = self.hass.data[DOMAIN][self.config_entry.entry_id]['auth']
-            _LOGGER.debug("Authenticating with PostNL API.")
-            await auth.check_and_refresh_token()
-
-            self.graphq_api = PostNLGraphql(auth.access_token)
-            self.jouw_api = PostNLJouwAPI(auth.access_token)
-
-            data: dict[str, list[Package]] = {
-                'receiver': [],
-                'sender': []
-            }
-
-            shipments = await self.hass.async_add_executor_job(self.graphq_api.shipments)
-
-            _LOGGER.debug("Shipments fetched: %s", shipments)
-            receiver_shipments = [self.transform_shipment(shipment) for shipment in
-                                  shipments.get('trackedShipments', {}).get('receiverShipments', [])]
-            data['receiver'] = await asyncio.gather(*receiver_shipments)
-
-            sender_shipments = [self.transform_shipment(shipment) for shipment in
-                                shipments.get('trackedShipments', {}).get('senderShipments', [])]
-            data['sender'] = await asyncio.gather(*sender_shipments)
-
-            _LOGGER.info("Updated PostNL data: %d receiver packages, %d sender packages.", len(data['receiver']), len(data['sender']))
-
-            return data
-        except requests.exceptions.RequestException as exception:
+            async with asyncio.timeout(UPDATE_TIMEOUT):
+                entry_data: PostNLRuntimeData = self.hass.data[DOMAIN][self.config_entry.entry_id]
+                auth = entry_data.auth
+                _LOGGER.debug("Authenticating with PostNL API.")
+                await auth.check_and_refresh_token()
+
+                self.graphq_api = entry_data.graphql
+                self.jouw_api = entry_data.jouw_api
+                self.graphq_api.update_token(auth.access_token)
+                self.jouw_api.update_token(auth.access_token)
+
+                data: dict[str, dict[str, list[Package]]] = {
+                    'receiver': {'enroute': [], 'delivered': []},
+                    'sender': {'enroute': [], 'delivered': []}
+                }
+
+                shipments = await self.graphq_api.shipments()
+
+                self._tnt_inflight.clear()
+
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Shipments fetched: %s", shipments)
+                tracked_shipments = shipments.get('trackedShipments', {})
+
+                tasks = []
+                task_shipments = []
+                for direction, shipments_list in (
+                        ('receiver', tracked_shipments.get('receiverShipments', [])),
+                        ('sender', tracked_shipments.get('senderShipments', []))
+                ):
+                    for shipment in shipments_list:
+                        if shipment.get('delivered'):
+                            data[direction]['delivered'].append(self.transform_delivered_shipment(shipment))
+                        else:
+                            tasks.append(asyncio.create_task(self.transform_shipment(shipment)))
+                            task_shipments.append((direction, shipment))
+
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+
+                failed = 0
+                for (direction, shipment), result in zip(task_shipments, results):
+                    if isinstance(result, BaseException):
+                        failed += 1
+                        previous = self._previous_package(direction, shipment.get('key'))
+                        if previous:
+                            _LOGGER.warning("Reusing last known data for shipment %s after update error: %s",
+                                            shipment.get('key'), result)
+                            data[direction]['delivered' if previous.delivered else 'enroute'].append(previous)
+                        else:
+                            _LOGGER.error("Skipping shipment %s after update error: %s",
+                                          shipment.get('key'), result)
+                        continue
+
+                    data[direction]['delivered' if result.delivered else 'enroute'].append(result)
+
+                if tasks and failed == len(tasks):
+                    raise UpdateFailed("All PostNL shipment updates failed")
+
+                _LOGGER.info("Updated PostNL data: %d receiver packages, %d sender packages.",
+                             len(data['receiver']['enroute']) + len(data['receiver']['delivered']),
+                             len(data['sender']['enroute']) + len(data['sender']['delivered']))
+
+                return data
+        except TransportQueryError as exception:
+            _LOGGER.debug("GraphQL error during PostNL data update: %s", exception)
+
+            error_code = None
+            if exception.errors:
+                error_code = exception.errors[0].get('extensions', {}).get('code')
+
+            if error_code in (401, '401', 'UNAUTHENTICATED'):
+                try:
+                    await auth.force_token_refresh()
+                except ClientError as refresh_exception:
+                    raise UpdateFailed("Unable to refresh PostNL token") from refresh_exception
+
+                raise UpdateFailed("PostNL GraphQL query was rejected") from exception
+
+            raise UpdateFailed("PostNL GraphQL query failed") from exception
+        except (ClientError, TimeoutError) as exception:
             _LOGGER.error("Network error during PostNL data update: %s", exception, exc_info=True)
             raise UpdateFailed("Unable to update PostNL data") from exception
 
+    def _previous_package(self, direction: str, key: str) -> Package | None:
+        """Return the last known Package for a shipment, if any."""
+        if not self.data:
+            return None
+
+        buckets = self.data.get(direction, {})
+        for package in (*buckets.get('enroute', []), *buckets.get('delivered', [])):
+            if package.key == key:
+                return package
+
+        return None
+
+    async def _track_and_trace(self, key: str, barcode: str) -> dict:
+        """Fetch track and trace details with a short-lived per-barcode cache."""
+        cached = self._tnt_cache.get(barcode)
+
+        if cached:
+            timestamp, etag, details = cached
+            if time.monotonic() - timestamp < TRACK_AND_TRACE_TTL:
+                _LOGGER.debug("Using cached Track and Trace details for %s", barcode)
+                return details
+        else:
+            etag = details = None
+
+        inflight = self._tnt_inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self.jouw_api.track_and_trace(key, etag=etag))
+            self._tnt_inflight[key] = inflight
+
+        response, etag = await inflight
+
+        if response is None:
+            _LOGGER.debug("Track and Trace details for %s not modified, reusing cached body", barcode)
+            response = details
+
+        if response is None:
+            # Another collo of the same shipment revalidated with its own ETag
+            # while this barcode has no cached body yet; fetch unconditionally.
+            response, etag = await self.jouw_api.track_and_trace(key)
+
+        self._tnt_cache[barcode] = (time.monotonic(), etag, response)
+
+        return response
+
+    def transform_delivered_shipment(self, shipment) -> Package:
+        """Build a Package for a delivered shipment, no remote call needed."""
+        key = shipment.get('key')
+        _LOGGER.debug('%s already delivered, no need to call jouw.postnl.', key)
+        self._tnt_cache.pop(shipment.get('barcode'), None)
+
+        return Package(
+            key=key,
+            name=shipment.get('title'),
+            url=shipment.get('detailsUrl'),
+            shipment_type=shipment.get('shipmentType'),
+            status_message="Pakket is bezorgd",
+            delivered=shipment.get('delivered'),
+            delivery_date=shipment.get('deliveredTimeStamp'),
+            delivery_address_type=shipment.get('deliveryAddressType')
+        )
+
     async def transform_shipment(self, shipment) -> Package:
-        _LOGGER.debug('Updating %s', shipment.get('key'))
+        key = shipment.get('key')
+        barcode = shipment.get('barcode')
+        delivery_window_from = shipment.get('deliveryWindowFrom')
+        delivery_window_to = shipment.get('deliveryWindowTo')
+
+        _LOGGER.debug('Updating %s', key)
 
         try:
-            if shipment.get('delivered'):
-                _LOGGER.debug('%s already delivered, no need to call jouw.postnl.', shipment.get('key'))
-
-                return Package(
-                    key=shipment.get('key'),
-                    name=shipment.get('title'),
-                    url=shipment.get('detailsUrl'),
-                    shipment_type=shipment.get('shipmentType'),
-                    status_message="Pakket is bezorgd",
-                    delivered=shipment.get('delivered'),
-                    delivery_date=shipment.get('deliveredTimeStamp'),
-                    delivery_address_type=shipment.get('deliveryAddressType')
-                )
-
-            _LOGGER.debug("Fetching Track and Trace details for shipment %s.", shipment['key'])
-            track_and_trace_details = await self.hass.async_add_executor_job(self.jouw_api.track_and_trace,
-                                                                             shipment['key'])
+            _LOGGER.debug("Fetching Track and Trace details for shipment %s.", key)
+            track_and_trace_details = await self._track_and_trace(key, barcode)
 
             if not track_and_trace_details.get('colli'):
-                _LOGGER.warning("No colli found for shipment %s. Details: %s", shipment['key'], track_and_trace_details)
+                _LOGGER.warning("No colli found for shipment %s. Details: %s", key, track_and_trace_details)
 
-            colli = track_and_trace_details.get('colli', {}).get(shipment['barcode'], {})
+            colli = track_and_trace_details.get('colli', {}).get(barcode, {})
 
             status_message = "Unknown"
 
             if colli:
-                _LOGGER.debug("Colli details found for shipment %s: %s", shipment['key'], colli)
-                if colli.get("routeInformation"):
-                    route_information = colli.get("routeInformation")
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Colli details found for shipment %s: %s", key, colli)
+                route_information = colli.get("routeInformation")
+                eta = colli.get('eta')
+
+                if route_information:
+                    planned_window = route_information.get("plannedDeliveryTimeWindow", {})
                     planned_date = route_information.get("plannedDeliveryTime")
-                    planned_from = route_information.get("plannedDeliveryTimeWindow", {}).get("startDateTime")
-                    planned_to = route_information.get("plannedDeliveryTimeWindow", {}).get('endDateTime')
+                    planned_from = planned_window.get("startDateTime")
+                    planned_to = planned_window.get('endDateTime')
                     expected_datetime = route_information.get('expectedDeliveryTime')
-                elif colli.get('eta'):
-                    planned_date = colli.get('eta', {}).get('start')
-                    planned_from = colli.get('eta', {}).get('start')
-                    planned_to = colli.get('eta', {}).get('end')
+                elif eta:
+                    planned_date = eta.get('start')
+                    planned_from = eta.get('start')
+                    planned_to = eta.get('end')
                     expected_datetime = None
                 else:
-                    planned_date = shipment.get('deliveryWindowFrom', None)
-                    planned_from = shipment.get('deliveryWindowFrom', None)
-                    planned_to = shipment.get('deliveryWindowTo', None)
+                    planned_date = delivery_window_from
+                    planned_from = delivery_window_from
+                    planned_to = delivery_window_to
                     expected_datetime = None
 
                 status_message = colli.get('statusPhase', {}).get('message', "Unknown")
             else:
-                _LOGGER.warning("Barcode not found in colli details for shipment %s.", shipment['key'])
-                planned_date = shipment.get('deliveryWindowFrom', None)
-                planned_from = shipment.get('deliveryWindowFrom', None)
-                planned_to = shipment.get('deliveryWindowTo', None)
+                _LOGGER.warning("Barcode not found in colli details for shipment %s.", key)
+                planned_date = delivery_window_from
+                planned_from = delivery_window_from
+                planned_to = delivery_window_to
                 expected_datetime = None
 
             return Package(
-                key=shipment.get('key'),
+                key=key,
                 name=shipment.get('title'),
                 url=shipment.get('detailsUrl'),
                 shipment_type=shipment.get('shipmentType'),
@@ -132,6 +249,6 @@ class PostNLCoordinator(DataUpdateCoordinator):
                 planned_to=planned_to,
                 expected_datetime=expected_datetime
             )
-        except requests.exceptions.RequestException as exception:
-            _LOGGER.error("Error fetching Track and Trace details for shipment %s: %s", shipment.get('key'), exception, exc_info=True)
+        except (ClientError, TimeoutError) as exception:
+            _LOGGER.error("Error fetching Track and Trace details for shipment %s: %s", key, exception, exc_info=True)
             raise UpdateFailed("Unable to update PostNL data") from exception
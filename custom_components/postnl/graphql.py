@@ -1,7 +1,7 @@
 import logging
 
 from gql import Client, gql
-from gql.transport.requests import RequestsHTTPTransport
+from gql.transport.aiohttp import AIOHTTPTransport
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -11,22 +11,24 @@ class PostNLGraphql:
     client: Client
 
     def __init__(self, access_token: str):
-        self.client = Client(transport=RequestsHTTPTransport(
+        self.headers = {
+            'Authorization': 'Bearer ' + access_token
+        }
+        self.client = Client(transport=AIOHTTPTransport(
             url=self.endpoint,
-            verify=True,
-            retries=3,
             timeout=60,
-            headers={
-                'Authorization': 'Bearer ' + access_token
-            }
+            headers=self.headers
         ))
 
-    def call(self, query: str):
+    def update_token(self, access_token: str) -> None:
+        self.headers['Authorization'] = 'Bearer ' + access_token
+
+    async def call(self, query: str):
         query = gql(query)
 
-        return self.client.execute(query)
+        return await self.client.execute_async(query)
 
-    def profile(self):
+    async def profile(self):
         _LOGGER.debug('Fetching profile')
         query = """
             query {
@@ -35,18 +37,18 @@ class PostNLGraphql:
                 __typename
               }
             }
-            
+
             fragment ProfileData on Profile {
               username
               __typename
             }
         """
 
-        result = self.call(query)
+        result = await self.call(query)
 
         return result
 
-    def shipments(self):
+    async def shipments(self):
         _LOGGER.debug('Fetching shipments')
 
         query = """
@@ -82,6 +84,6 @@ class PostNLGraphql:
         }
         """
 
-        result = self.call(query)
+        result = await self.call(query)
 
         return result
@@ -1,33 +1,54 @@
+import asyncio
 import logging
+import random
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3 import Retry
+import orjson
+from aiohttp import ClientError, ClientSession
 
 _LOGGER = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = 30
+RETRY_ATTEMPTS = 3
+
 
 class PostNLJouwAPI:
     base_url: str = "https://jouw.postnl.nl/track-and-trace/"
 
-    def __init__(self, access_token: str):
-        self.client = requests.Session()
-        self.client.mount(
-            prefix='https://',
-            adapter=HTTPAdapter(
-                max_retries=Retry(
-                    total=5,
-                    backoff_factor=3
-                ),
-                pool_maxsize=25,
-                pool_block=True
-            )
-        )
-        self.client.headers = {
+    def __init__(self, access_token: str, session: ClientSession):
+        self.session = session
+        self.headers = {
             "Authorization": "Bearer " + access_token
         }
 
-    def track_and_trace(self, key):
-        response = self.client.get(self.base_url + "/api/trackAndTrace/" + key + "?language=nl")
+    def update_token(self, access_token: str) -> None:
+        self.headers["Authorization"] = "Bearer " + access_token
+
+    async def track_and_trace(self, key, etag: str | None = None):
+        """Fetch track and trace details, returning the body and its ETag.
+
+        Returns (None, etag) when the server replies 304 Not Modified.
+        Transient failures are retried with jittered exponential backoff.
+        """
+        headers = self.headers
+        if etag:
+            headers = {**self.headers, "If-None-Match": etag}
+
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                async with asyncio.timeout(REQUEST_TIMEOUT):
+                    async with self.session.get(
+                            self.base_url + "/api/trackAndTrace/" + key + "?language=nl",
+                            headers=headers
+                    ) as response:
+                        if response.status == 304:
+                            return None, etag
+
+                        return await response.json(loads=orjson.loads), response.headers.get("ETag")
+            except (ClientError, TimeoutError) as exception:
+                if attempt == RETRY_ATTEMPTS - 1:
+                    raise
 
-        return response.json()
+                delay = 0.5 * 2 ** attempt + random.uniform(0, 0.5)
+                _LOGGER.debug("Track and Trace request for %s failed (%s), retrying in %.1fs",
+                              key, exception, delay)
+                await asyncio.sleep(delay)
@@ -1,8 +1,7 @@
 import logging
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3 import Retry
+import orjson
+from aiohttp import ClientSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -10,22 +9,18 @@ _LOGGER = logging.getLogger(__name__)
 class PostNLLoginAPI:
     base_url: str = "https://login.postnl.nl/101112a0-4a0f-4bbb-8176-2f1b2d370d7c/"
 
-    def __init__(self, access_token: str):
-        self.client = requests.Session()
-        self.client.mount(
-            prefix='https://',
-            adapter=HTTPAdapter(
-                max_retries=Retry(
-                    total=5,
-                    backoff_factor=3
-                )
-            )
-        )
-        self.client.headers = {
+    def __init__(self, access_token: str, session: ClientSession):
+        self.session = session
+        self.headers = {
             "Authorization": "Bearer " + access_token
         }
 
-    def userinfo(self):
-        response = self.client.get(self.base_url + "/profiles/oidc/userinfo")
+    def update_token(self, access_token: str) -> None:
+        self.headers["Authorization"] = "Bearer " + access_token
 
-        return response.json()
+    async def userinfo(self):
+        async with self.session.get(
+                self.base_url + "/profiles/oidc/userinfo",
+                headers=self.headers
+        ) as response:
+            return await response.json(loads=orjson.loads)
@@ -22,7 +22,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     coordinator = PostNLCoordinator(hass)
     await coordinator.async_config_entry_first_refresh()
     
-    userinfo = hass.data[DOMAIN][entry.entry_id].get("userinfo", {})
+    userinfo = hass.data[DOMAIN][entry.entry_id].userinfo or {}
     if not userinfo:
         _LOGGER.error("No userinfo found for PostNL entry")
         return
@@ -111,18 +111,12 @@ class PostNLDelivery(CoordinatorEntity, Entity):
         self.async_write_ha_state()
 
     def handle_coordinator_data(self):
-        self._attributes['delivered'] = []
-        self._attributes['enroute'] = []
-
         if self.receiver:
             coordinator_data = self.coordinator.data['receiver']
         else:
             coordinator_data = self.coordinator.data['sender']
 
-        for package in coordinator_data:
-            if package.delivered:
-                self._attributes['delivered'].append(vars(package))
-            else:
-                self._attributes['enroute'].append(vars(package))
+        self._attributes['delivered'] = [package.as_dict() for package in coordinator_data['delivered']]
+        self._attributes['enroute'] = [package.as_dict() for package in coordinator_data['enroute']]
 
         self._state = len(self._attributes['enroute'])
@@ -1,3 +1,7 @@
+from dataclasses import dataclass, field, fields
+
+
+@dataclass(slots=True)
 class Package:
     key: str
     name: str
@@ -5,37 +9,21 @@ class Package:
     shipment_type: str
     status_message: str
     delivered: bool
-    delivery_date: str | None
-    delivery_address_type: str | None
-    planned_date: str | None
-    planned_from: str | None
-    planned_to: str | None
-    expected_datetime: str | None
+    delivery_date: str | None = None
+    delivery_address_type: str | None = None
+    planned_date: str | None = None
+    planned_from: str | None = None
+    planned_to: str | None = None
+    expected_datetime: str | None = None
+    _as_dict: dict | None = field(default=None, init=False, repr=False, compare=False)
+
+    def as_dict(self) -> dict:
+        """Return the package as a dict, computed once per package."""
+        if self._as_dict is None:
+            self._as_dict = {
+                f.name: getattr(self, f.name)
+                for f in fields(self)
+                if not f.name.startswith('_')
+            }
 
-    def __init__(
-            self,
-            key: str,
-            name: str,
-            url: str,
-            shipment_type: str,
-            status_message: str,
-            delivered: bool,
-            delivery_date: str | None = None,
-            delivery_address_type: str | None = None,
-            planned_date: str | None = None,
-            planned_from: str | None = None,
-            planned_to: str | None = None,
-            expected_datetime: str | None = None,
-    ):
-        self.key = key
-        self.name = name
-        self.url = url
-        self.shipment_type = shipment_type
-        self.status_message = status_message
-        self.delivered = delivered
-        self.delivery_date = delivery_date
-        self.delivery_address_type = delivery_address_type
-        self.planned_date = planned_date
-        self.planned_from = planned_from
-        self.planned_to = planned_to
-        self.expected_datetime = expected_datetime
+        return self._as_dict